@@ -0,0 +1,212 @@
+# ==============================================================================
+# 0. IMPORTY
+# ==============================================================================
+
+import pandas as pd
+import tracemalloc
+import gc
+import random
+import json
+import time
+from bgg_common import clean_html_text, process_list_to_prefix_format
+from bgg_records import PROPERTY_ORDER, iter_records, build_records, render_record
+
+# ==============================================================================
+# 1. KONFIGURACE
+# ==============================================================================
+
+# Benchmark alokací: původní serializace (iterrows + data_bucket + add())
+# vs. GameRecord (bgg_records.py). Běží nad syntetickými daty, bez stahování datasetu.
+
+N_GAMES = 10_000
+SEED = 42
+
+# ==============================================================================
+# 2. SYNTETICKÁ DATA
+# ==============================================================================
+
+def make_synthetic_df(n=N_GAMES, seed=SEED):
+    rnd = random.Random(seed)
+    mechanics = ["Dice Rolling", "Hand Management", "Set Collection", "Area Control", "Worker Placement"]
+    categories = ["Card Game", "Economic", "Fantasy", "Wargame", "Party Game"]
+    people = [f"Designer {i}" for i in range(500)]
+    publishers = ["Kosmos", "Rio Grande Games", "Hans im Glück", "Days of Wonder, Inc"]
+
+    def pick(pool, k):
+        return ", ".join(rnd.sample(pool, rnd.randint(0, k)))
+
+    rows = []
+    for game_id in range(1, n + 1):
+        rows.append({
+            "game_id": game_id,
+            "name": f"Game {game_id} &amp; Friends",
+            "description": "A game about trading &quot;goods&quot;.&#10;" * rnd.randint(5, 40),
+            "year_published": rnd.choice([1995, 2005, 2015, ""]),
+            "min_players": rnd.randint(1, 3), "max_players": rnd.randint(2, 8),
+            "min_playtime": 30, "max_playtime": 90, "playing_time": 60, "min_age": 10,
+            "artist": pick(people, 2), "designer": pick(people, 3), "publisher": pick(publishers, 2),
+            "category": pick(categories, 3), "mechanic": pick(mechanics, 4),
+            "family": "", "compilation": "", "expansion": "",
+            "average_rating": round(rnd.uniform(4, 9), 3), "users_rated": rnd.randint(0, 50_000),
+        })
+    return pd.DataFrame(rows)
+
+# ==============================================================================
+# 3. PŮVODNÍ IMPLEMENTACE (PRO SROVNÁNÍ)
+# ==============================================================================
+
+def legacy_buckets(df):
+    """Původní per-row logika serializéru: generuje (game_id, data_bucket) pro každý řádek."""
+    for _, row in df.iterrows():
+        data_bucket = {}
+        def add(predicate, val_str):
+            if predicate not in data_bucket: data_bucket[predicate] = []
+            data_bucket[predicate].append(val_str)
+
+        if row['name']:
+            add("schema:name", json.dumps(clean_html_text(row['name']), ensure_ascii=False))
+        if row['description']:
+            add("schema:description", json.dumps(clean_html_text(row['description']), ensure_ascii=False))
+        try:
+            add("schema:datePublished", f'"{str(int(float(row["year_published"])))}"^^xsd:gYear')
+        except: pass
+
+        for col, pred in [('min_players', 'bgg:minPlayers'), ('max_players', 'bgg:maxPlayers'),
+                          ('min_playtime', 'bgg:minPlaytime'), ('max_playtime', 'bgg:maxPlaytime'),
+                          ('playing_time', 'bgg:playingTime'), ('min_age', 'bgg:minAge')]:
+            try:
+                if float(row[col]) > 0:
+                    add(pred, f'"{int(float(row[col]))}"^^xsd:integer')
+            except: pass
+
+        for col, pred, prefix in [('artist', 'schema:contributor', 'agent'), ('designer', 'schema:author', 'agent'),
+                                  ('publisher', 'schema:publisher', 'agent'), ('category', 'schema:genre', 'category'),
+                                  ('mechanic', 'bgg:hasMechanic', 'mechanic'), ('family', 'schema:partOfSeries', 'family'),
+                                  ('compilation', 'schema:isPartOf', 'comp'), ('expansion', 'bgg:hasExpansion', 'exp')]:
+            for slug in process_list_to_prefix_format(row[col]):
+                add(pred, f"{prefix}:{slug}")
+
+        try:
+            if row['average_rating']:
+                add("bgg:ratingValue", f'"{float(row["average_rating"])}"^^xsd:decimal')
+            if row['users_rated']:
+                add("bgg:ratingCount", f'"{int(float(row["users_rated"]))}"^^xsd:integer')
+        except: pass
+
+        yield row['game_id'], data_bucket
+
+def legacy_render(game_id, data_bucket):
+    subject_uri = f"game:{game_id}"
+    out = [f"{subject_uri} a schema:Game .\n\n" if not data_bucket else f"{subject_uri} a schema:Game ;\n"]
+
+    valid_keys = [k for k in PROPERTY_ORDER if k in data_bucket]
+    for i, key in enumerate(valid_keys):
+        indent_str = "\n" + (" " * (4 + len(key) + 1))
+        values_joined = ("," + indent_str).join(data_bucket[key])
+        terminator = "." if (i == len(valid_keys) - 1) else ";"
+        out.append(f"    {key} {values_joined} {terminator}\n")
+
+    out.append("\n")
+    return "".join(out)
+
+# ==============================================================================
+# 4. MĚŘENÍ
+# ==============================================================================
+
+def measure(label, fn):
+    """Spustí fn pod tracemalloc, vrací (špička B, zůstatek B)."""
+    gc.collect()
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    result = fn()
+    duration = time.perf_counter() - t0
+    # Uvolní volné seznamy interpretu (n-tice, floaty), aby "drženo" byla jen živá data
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"   {label:<38} špička: {peak / 2**20:8.2f} MB | drženo: {current / 2**20:8.2f} MB | {duration:6.2f} s")
+    del result
+    return peak, current
+
+def measure_allocated(label, items, render):
+    """
+    Kumulativní alokace streamované serializace: pro každou hru se změří špička
+    alokací od převzetí záznamu z generátoru po vykreslení Turtle bloku
+    (tracemalloc.reset_peak) a sečte se přes všechny hry.
+    Jde o dolní odhad - paměť uvolněná a znovu alokovaná uvnitř jedné hry se počítá jednou.
+    Vrací (alokováno B, počet her).
+    """
+    gc.collect()
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    iterator = iter(items)
+    allocated = 0
+    count = 0
+    while True:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        try:
+            item = next(iterator)
+        except StopIteration:
+            break
+        render(item)
+        allocated += tracemalloc.get_traced_memory()[1] - base
+        count += 1
+    duration = time.perf_counter() - t0
+    tracemalloc.stop()
+
+    print(f"   {label:<38} alokováno: {allocated / 2**20:8.2f} MB | na hru: {allocated / max(count, 1) / 1024:6.2f} KB | {duration:6.2f} s")
+    return allocated, count
+
+def with_dataset(build):
+    """
+    Vytvoří DataFrame uvnitř měřeného úseku a vrátí (df, build(df)), aby srovnání
+    držené paměti bylo férové: GameRecord odkazuje na řetězce popisů v df,
+    data_bucket drží jejich vyčištěné kopie - df se tak počítá oběma cestám.
+    """
+    df = make_synthetic_df()
+    return df, build(df)
+
+def main():
+    df = make_synthetic_df()
+    scale = 10_000 / len(df)
+    print(f"=== BENCHMARK ZÁZNAMŮ HER ({len(df)} her, hodnoty přepočteny na 10k) ===")
+
+    # Kontrola, že obě cesty dávají stejný Turtle výstup
+    head = df.head(500)
+    legacy_out = "".join(legacy_render(gid, bucket) for gid, bucket in legacy_buckets(head))
+    records_out = "".join(render_record(r) for r in iter_records(head))
+    assert legacy_out == records_out, "Výstup GameRecord se liší od původní serializace!"
+    print("[OK] Výstup je shodný s původní serializací.")
+
+    print("\n[1] Serializace (streamování, výstup se zahazuje):")
+    legacy_peak, _ = measure("iterrows + data_bucket + add()",
+                             lambda: sum(len(legacy_render(g, b)) for g, b in legacy_buckets(df)))
+    records_peak, _ = measure("iter_records + render_record",
+                              lambda: sum(len(render_record(r)) for r in iter_records(df)))
+
+    print("\n[2] Serializace - kumulativní alokace (součet špiček na hru):")
+    legacy_alloc, _ = measure_allocated("iterrows + data_bucket + add()",
+                                        legacy_buckets(df), lambda item: legacy_render(*item))
+    records_alloc, _ = measure_allocated("iter_records + render_record",
+                                         iter_records(df), render_record)
+
+    print("\n[3] Všechny hry držené v paměti, včetně DataFrame (pro analytiku/podobnost):")
+    _, df_held = measure("samotný DataFrame", lambda: make_synthetic_df())
+    _, legacy_held = measure("DataFrame + seznam data_bucket", lambda: with_dataset(lambda d: list(legacy_buckets(d))))
+    _, records_held = measure("DataFrame + seznam GameRecord", lambda: with_dataset(build_records))
+    _, links_held = measure("DataFrame + GameRecord (bez literálů)",
+                            lambda: with_dataset(lambda d: build_records(d, with_literals=False)))
+
+    def mb(value):
+        return f"{value * scale / 2**20:.2f} MB"
+
+    print("\n[VÝSLEDEK] na 10k her:")
+    print(f"   špička serializace:   {mb(legacy_peak)} -> {mb(records_peak)}")
+    print(f"   alokace serializace:  {mb(legacy_alloc)} -> {mb(records_alloc)}")
+    print(f"   držená paměť:         {mb(legacy_held)} -> {mb(records_held)} (bez literálů {mb(links_held)}), "
+          f"z toho DataFrame {mb(df_held)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+# ==============================================================================
+# 0. IMPORTY
+# ==============================================================================
+
+import numpy as np
+import scipy.sparse as sp
+from pathlib import Path
+import json
+from bgg_common import prefix_header, load_dataset
+from bgg_records import build_records
+
+# ==============================================================================
+# 1. KONFIGURACE
+# ==============================================================================
+
+version = "final"
+
+SCRIPT_DIR = Path(__file__).parent.resolve()
+OUTPUT_DIR = SCRIPT_DIR / "output" / "analytics"
+OUTPUT_TTL = SCRIPT_DIR / "output" / f"analytics_{version}.ttl"
+
+# Co zapisovat: agregované triple do .ttl a/nebo matice do .npz
+WRITE_TTL = True
+WRITE_NPZ = True
+
+# Dvojice s menším počtem společných her se do .ttl nezapisují (šum)
+MIN_WEIGHT = 2
+
+# Incidenční matice (hry × entity): název -> (predikáty záznamu hry, Turtle prefix)
+INCIDENCE_SPECS = {
+    "mechanics":  (['bgg:hasMechanic'],  "mechanic"),
+    "categories": (['schema:genre'],     "category"),
+    "designers":  (['schema:author'],    "agent"),
+    "publishers": (['schema:publisher'], "agent"),
+}
+
+# Agregace: název -> (řádková matice, sloupcová matice, symetrická?)
+#   symetrická = entita × entita téhož typu, zapisuje se jen horní trojúhelník bez diagonály
+AGGREGATES = {
+    "mechanic_category":      ("mechanics",  "categories", False),
+    "designer_collaboration": ("designers",  "designers",  True),
+    "publisher_mechanic":     ("publishers", "mechanics",  False),
+    "publisher_category":     ("publishers", "categories", False),
+}
+
+# ==============================================================================
+# 2. INCIDENČNÍ MATICE
+# ==============================================================================
+
+def build_incidence(records, predicates):
+    """
+    Sestaví binární řídkou matici hry × entity (CSR) ze záznamů her (GameRecord).
+    Entity jsou slugy objektů daných predikátů - stejné jako IRI v serializéru.
+
+    Vrací (matice, seznam slugů podle indexu sloupce).
+    Řádky odpovídají pořadí records.
+    """
+    vocab = {}
+    rows = []
+    cols = []
+
+    for i, record in enumerate(records):
+        for predicate in predicates:
+            for slug in record.slugs(predicate):
+                rows.append(i)
+                cols.append(vocab.setdefault(slug, len(vocab)))
+
+    data = np.ones(len(rows), dtype=np.int32)
+    matrix = sp.csr_matrix((data, (rows, cols)), shape=(len(records), len(vocab)))
+
+    # Duplicitní položka v jedné buňce se při konstrukci sečte -> zpět na 0/1
+    matrix.data[:] = 1
+    return matrix, list(vocab)
+
+def build_all_incidences(records):
+    """
+    Vrací {název: (matice, slugy, prefix)} pro všechny INCIDENCE_SPECS.
+    """
+    incidences = {}
+    for name, (predicates, prefix) in INCIDENCE_SPECS.items():
+        matrix, labels = build_incidence(records, predicates)
+        incidences[name] = (matrix, labels, prefix)
+        print(f"[INFO] Matice hry × {name}: {matrix.shape[0]} × {matrix.shape[1]}, nenulových: {matrix.nnz}")
+    return incidences
+
+def cooccurrence(row_matrix, col_matrix, symmetric):
+    """
+    Počty společných her pro každou dvojici entit: A^T · B (řídký součin).
+    U symetrické agregace se ponechá jen horní trojúhelník bez diagonály.
+    """
+    counts = (row_matrix.T @ col_matrix).tocoo()
+    if symmetric:
+        counts = sp.triu(counts, k=1).tocoo()
+    return counts
+
+# ==============================================================================
+# 3. VÝSTUP
+# ==============================================================================
+
+def save_npz(name, counts, row_labels, col_labels):
+    """
+    Uloží matici do '<název>.npz' a popisky řádků/sloupců do '<název>_labels.json'.
+    """
+    sp.save_npz(OUTPUT_DIR / f"{name}.npz", counts.tocsr())
+    with open(OUTPUT_DIR / f"{name}_labels.json", "w", encoding="utf-8") as f:
+        json.dump({"rows": row_labels, "cols": col_labels}, f, ensure_ascii=False)
+
+def write_cooccurrence_ttl(f, counts, row_labels, row_prefix, col_labels, col_prefix):
+    """
+    Zapíše vážené uzly:
+        mechanic:X bgg:coOccursWith [ a bgg:CoOccurrence ;
+                                      bgg:coOccurringEntity category:Y ;
+                                      bgg:weight "12"^^xsd:integer ] .
+    Vrací počet zapsaných uzlů.
+    """
+    mask = counts.data >= MIN_WEIGHT
+    written = 0
+
+    # Seřazení podle řádku (subjektu) a sestupně podle váhy kvůli čitelnosti výstupu
+    order = np.lexsort((-counts.data[mask], counts.row[mask]))
+    for r, c, w in zip(counts.row[mask][order], counts.col[mask][order], counts.data[mask][order]):
+        f.write(f"{row_prefix}:{row_labels[r]} bgg:coOccursWith [ a bgg:CoOccurrence ; "
+                f"bgg:coOccurringEntity {col_prefix}:{col_labels[c]} ; "
+                f'bgg:weight "{int(w)}"^^xsd:integer ] .\n')
+        written += 1
+    return written
+
+# ==============================================================================
+# 4. HLAVNÍ PROCES
+# ==============================================================================
+
+def main():
+    print("=== ANALYTIKA: Řídké matice společného výskytu ===")
+
+    records = build_records(load_dataset(), with_literals=False)
+    incidences = build_all_incidences(records)
+
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+
+    ttl_file = None
+    if WRITE_TTL:
+        ttl_file = open(OUTPUT_TTL, "w", encoding="utf-8")
+        ttl_file.write(prefix_header("xsd", "bgg", "agent", "category", "mechanic"))
+
+    try:
+        for name, (row_name, col_name, symmetric) in AGGREGATES.items():
+            row_matrix, row_labels, row_prefix = incidences[row_name]
+            col_matrix, col_labels, col_prefix = incidences[col_name]
+
+            counts = cooccurrence(row_matrix, col_matrix, symmetric)
+            print(f"[STATS] {name}: {counts.nnz} nenulových dvojic")
+
+            if WRITE_NPZ:
+                save_npz(name, counts, row_labels, col_labels)
+
+            if ttl_file:
+                ttl_file.write(f"# --- {name} ---\n")
+                written = write_cooccurrence_ttl(ttl_file, counts, row_labels, row_prefix, col_labels, col_prefix)
+                ttl_file.write("\n")
+                print(f"[INFO] {name}: zapsáno {written} uzlů (váha >= {MIN_WEIGHT})")
+    finally:
+        if ttl_file: ttl_file.close()
+
+    print(f"[SUCCESS] Hotovo. Výstup: {OUTPUT_DIR}" + (f", {OUTPUT_TTL}" if WRITE_TTL else ""))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+# ==============================================================================
+# 0. IMPORTY
+# ==============================================================================
+
+import pandas as pd
+from pathlib import Path
+import re
+import html
+import unicodedata
+
+# ==============================================================================
+# 1. KONFIGURACE
+# ==============================================================================
+
+KAGGLE_DATASET = "sujaykapadnis/board-games"
+
+# Textové sloupce, které load_dataset normalizuje (entity, mojibake, řídicí znaky, NFC)
+TEXT_COLUMNS = [
+    'name', 'description', 'designer', 'artist', 'publisher',
+    'category', 'mechanic', 'family', 'compilation', 'expansion',
+]
+
+# Prefixy IRI používané serializérem i linkery (prefix -> namespace)
+PREFIX_IRIS = {
+    "rdf": "http://www.w3.org/1999/02/22-rdf-syntax-ns#",
+    "rdfs": "http://www.w3.org/2000/01/rdf-schema#",
+    "xsd": "http://www.w3.org/2001/XMLSchema#",
+    "owl": "http://www.w3.org/2002/07/owl#",
+    "skos": "http://www.w3.org/2004/02/skos/core#",
+    "schema": "http://schema.org/",
+    "bgg": "http://example.org/ontology/",
+    "game": "http://example.org/game/",
+    "agent": "http://example.org/agent/",
+    "category": "http://example.org/category/",
+    "mechanic": "http://example.org/mechanic/",
+    "family": "http://example.org/family/",
+    "comp": "http://example.org/compilation/",
+    "exp": "http://example.org/expansion/",
+}
+
+# ==============================================================================
+# 2. POMOCNÉ FUNKCE PRO ČIŠTĚNÍ DAT
+# ==============================================================================
+
+def clean_for_prefix(text):
+    """
+    Převede vstupní text na formát bezpečný pro Turtle URI.
+
+    Změny:
+    - Řeší horní indexy (² -> 2, ³ -> 3).
+    - Řeší zlomky (½ -> 1_2).
+    - Ořezává i pomlčky na začátku/konci.
+    """
+    if pd.isna(text) or text == "": return ""
+
+    s = str(text)
+
+    # 1. Specifické firemní přípony
+    s = s.replace(", Inc", " Inc").replace(", Ltd", " Ltd").replace(", LLC", " LLC")
+
+    # 2. Náhrada znaků
+    s = s.replace(" / ", "-").replace("/", "-")
+    s = s.replace("&", "and")
+
+    # --- OPRAVA INDEXŮ A ZLOMKŮ ---
+    s = s.replace("²", "2").replace("³", "3")
+    s = s.replace("½", "1_2")  # Např. "War ½" -> "War_1_2"
+
+    # 3. Whitelist filtrování
+    # \w bere i Azbuku, Čínštinu, Diakritiku...
+    s = re.sub(r'[^\w-]', '_', s)
+
+    # 4. Redukce vícenásobných podtržítek
+    s = re.sub(r'_+', '_', s)
+
+    # 5. Ořez (strip) - i pomlčky, aby nevzniklo "-Hra"
+    s = s.strip('_').strip('-')
+
+    if not s:
+        return "unknown"
+
+    return s
+
+# --- Vzory pro rychlou předkontrolu textu ---
+
+# HTML entity: &amp; &#10; &#x27; ... i starší zápis bez středníku ('&amp', '&#39'),
+# který html.unescape také dekóduje
+_ENTITY_PATTERN = r"&(?:[A-Za-z][A-Za-z0-9]*|#[0-9]+|#[xX][0-9A-Fa-f]+);?"
+
+# Mojibake: UTF-8 bajty přečtené jako cp1252/latin-1, např. 'Ã©' (é), 'â€™' (')
+# = úvodní bajt (Â-ô) následovaný 1-3 pokračovacími bajty (0x80-0xBF nebo jejich cp1252 podoba)
+_CP1252_SPECIALS = "€‚ƒ„…†‡ˆ‰Š‹ŒŽ‘’“”•–—˜™š›œžŸ"
+_MOJIBAKE_PATTERN = f"[\u00c2-\u00f4][\u0080-\u00bf{_CP1252_SPECIALS}]{{1,3}}"
+
+# Řídicí znaky kromě tabulátoru a konců řádků
+_CONTROL_PATTERN = r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]"
+
+# Samostatné kombinační diakritické znaky (text není v NFC)
+_COMBINING_PATTERN = r"[\u0300-\u036f]"
+
+MOJIBAKE_RE = re.compile(_MOJIBAKE_PATTERN)
+CONTROL_RE = re.compile(_CONTROL_PATTERN)
+SUSPICIOUS_RE = re.compile("|".join([_ENTITY_PATTERN, _MOJIBAKE_PATTERN, _CONTROL_PATTERN, _COMBINING_PATTERN]))
+
+def _is_plausible_repair(decoded):
+    """
+    Opravu přijmeme, jen když vede na znaky, které v mojibake typicky končí:
+    latinka s diakritikou (U+00A0-U+017F) nebo typografická interpunkce
+    (U+2000-U+206F, €, ™). Jinak jde nejspíš o legitimní text, který se jen
+    náhodou dekóduje jako UTF-8 (např. 'ß“' -> U+07D3, 'É…' -> U+0245).
+    """
+    return all(
+        "\u00a0" <= ch <= "\u017f" or "\u2000" <= ch <= "\u206f" or ch in "€™"
+        for ch in decoded
+    )
+
+def _fix_mojibake_run(match):
+    """
+    Zkusí jeden podezřelý úsek vrátit na původní bajty a dekódovat jako UTF-8.
+    Znaky z cp1252 (€, ™...) se převedou přes cp1252, ostatní (vč. C1 znaků
+    z latin-1, např. '\x9d') přímo podle kódu znaku.
+    Zkouší se nejdelší předpona úseku, která dává věrohodný výsledek;
+    když žádná (legitimní text, např. 'é°' nebo 'ß“'), úsek se nechá beze změny.
+    """
+    run = match.group(0)
+    for length in range(len(run), 1, -1):
+        try:
+            raw = b"".join(bytes([ord(ch)]) if ord(ch) < 256 else ch.encode("cp1252") for ch in run[:length])
+            decoded = raw.decode("utf-8")
+        except UnicodeError:
+            continue
+        if _is_plausible_repair(decoded):
+            return decoded + run[length:]
+    return run
+
+def repair_text(text):
+    """
+    Plná oprava textu: HTML entity (i dvojitě escapované), mojibake,
+    odstranění řídicích znaků a normalizace do NFC.
+    """
+    s = str(text)
+
+    # Max. 2 průchody - dataset obsahuje i '&amp;#10;'
+    for _ in range(2):
+        unescaped = html.unescape(s)
+        if unescaped == s: break
+        s = unescaped
+
+    s = MOJIBAKE_RE.sub(_fix_mojibake_run, s)
+    s = CONTROL_RE.sub("", s)
+    s = unicodedata.normalize("NFC", s)
+
+    return s.strip()
+
+def clean_html_text(text):
+    """
+    Vyčistí text pro literál.
+    Rychlá cesta: text bez podezřelých vzorů (entity, mojibake, řídicí znaky,
+    kombinační znaky) se jen ořízne, ostatní jde přes repair_text.
+    """
+    if pd.isna(text) or text == "":
+        return ""
+
+    text = str(text)
+    if SUSPICIOUS_RE.search(text) is None:
+        return text.strip()
+
+    return repair_text(text)
+
+def normalize_text_columns(df, columns=TEXT_COLUMNS):
+    """
+    Opraví textové sloupce df na místě.
+    Vektorová předkontrola (str.contains) označí jen podezřelé buňky a jen ty
+    jdou přes repair_text - čisté řádky se nezpracovávají vůbec.
+
+    Vrací počty opravených (změněných) buněk podle sloupce.
+    """
+    repaired = {}
+    for col in columns:
+        if col not in df.columns: continue
+
+        values = df[col].astype(str)
+        mask = values.str.contains(SUSPICIOUS_RE, regex=True)
+        if not mask.any():
+            repaired[col] = 0
+            continue
+
+        fixed = values[mask].map(repair_text)
+        changed = fixed != values[mask]
+        df.loc[fixed.index, col] = fixed
+        repaired[col] = int(changed.sum())
+
+    return repaired
+
+def split_list_items(raw_text):
+    """
+    Rozdělí textový řetězec se seznamem (odděleným čárkami) na jednotlivé položky.
+    Firemní přípony (", Inc" apod.) se předem spojí, aby se podle nich nedělilo.
+    """
+    if pd.isna(raw_text) or raw_text == "" or str(raw_text).lower() == "nan":
+        return []
+
+    text = str(raw_text).replace(", Inc", " Inc").replace(", Ltd", " Ltd").replace(", LLC", " LLC")
+
+    return [item.strip() for item in text.split(',') if item.strip()]
+
+def process_list_to_prefix_format(raw_text):
+    """
+    Zpracuje textový řetězec obsahující seznam (oddělený čárkami) na seznam bezpečných slugů.
+    Používá funkci clean_for_prefix pro každou položku.
+    """
+    cleaned_slugs = []
+    for item in split_list_items(raw_text):
+        safe_slug = clean_for_prefix(item)
+        if safe_slug:
+            cleaned_slugs.append(safe_slug)
+
+    return cleaned_slugs
+
+def clean_literal_list(raw_text):
+    """
+    Pomocná funkce pro prosté rozdělení řetězce podle čárek bez složité normalizace.
+    """
+    if pd.isna(raw_text) or raw_text == "": return []
+    return [x.strip() for x in str(raw_text).split(',') if x.strip()]
+
+def prefix_header(*prefixes):
+    """
+    Vrátí blok '@prefix' řádků pro zadané prefixy (včetně prázdného řádku na konci).
+    """
+    lines = [f"@prefix {p}: <{PREFIX_IRIS[p]}> .\n" for p in prefixes]
+    return "".join(lines) + "\n"
+
+# ==============================================================================
+# 3. NAČTENÍ DATASETU
+# ==============================================================================
+
+def load_dataset(normalize=True):
+    """
+    Stáhne (nebo vezme z cache) dataset z Kaggle a načte první CSV soubor.
+    Prázdné hodnoty jsou nahrazeny prázdným řetězcem a textové sloupce
+    normalizovány (normalize_text_columns), aby všechny fáze viděly stejný text.
+    """
+    # Import až zde - pomocné funkce výše jdou používat i bez kagglehub
+    import kagglehub
+
+    print("[INFO] Stahuji dataset z Kaggle…")
+    dataset_path = Path(kagglehub.dataset_download(KAGGLE_DATASET))
+    print(f"[INFO] Dataset uložen v: {dataset_path}")
+
+    csv_files = list(dataset_path.glob("*.csv"))
+    if not csv_files:
+        raise FileNotFoundError("V datasetu nebyl nalezen žádný CSV soubor.")
+
+    csv_path = csv_files[0]
+    print(f"[INFO] Používám CSV: {csv_path.name}")
+
+    df = pd.read_csv(csv_path).fillna("")
+
+    if normalize:
+        repaired = normalize_text_columns(df)
+        details = ", ".join(f"{col}: {n}" for col, n in repaired.items() if n)
+        print(f"[INFO] Normalizace textu: opraveno {sum(repaired.values())} buněk" + (f" ({details})" if details else ""))
+
+    return df
+
+# ==============================================================================
+# 4. KONTROLA NORMALIZACE TEXTU (python bgg_common.py)
+# ==============================================================================
+
+# (vstup, očekávaný výstup repair_text) - regresní případy včetně legitimního
+# německého a francouzského textu s typografickými uvozovkami, který se nesmí změnit
+TEXT_REPAIR_CASES = [
+    ("CafÃ© Ãœber", "Café Über"),
+    ("It&#039;s â€œgoodâ€\x9d", "It's “good”"),
+    ("Catan &amp;amp; more", "Catan & more"),
+    ("Tom &amp Jerry", "Tom & Jerry"),
+    ("It&#39s a &quot;deal&quot", "It's a \"deal\""),
+    ("AT&T & Friends", "AT&T & Friends"),
+    ("a\x07b", "ab"),
+    ("Cafe\u0301", "Café"),
+    ("Der „Spaß“ beginnt", "Der „Spaß“ beginnt"),
+    ("Ü–Boot", "Ü–Boot"),
+    ("CAFÉ…", "CAFÉ…"),
+    ("Größe: „Spiel des Jahres“ – Preisträger", "Größe: „Spiel des Jahres“ – Preisträger"),
+    ("« Les Aventuriers du Rail » : un jeu très apprécié…", "« Les Aventuriers du Rail » : un jeu très apprécié…"),
+    ("L’été à Noël — “Très” bien", "L’été à Noël — “Très” bien"),
+    ("naïve ©, é°", "naïve ©, é°"),
+]
+
+if __name__ == "__main__":
+    failures = 0
+    for text, expected in TEXT_REPAIR_CASES:
+        result = repair_text(text)
+        if result != expected:
+            failures += 1
+            print(f"[CHYBA] {text!r} -> {result!r}, očekáváno {expected!r}")
+
+    if failures:
+        raise SystemExit(f"[CHYBA] {failures} z {len(TEXT_REPAIR_CASES)} případů selhalo.")
+    print(f"[OK] Všech {len(TEXT_REPAIR_CASES)} případů normalizace textu prošlo.")
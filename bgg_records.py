@@ -0,0 +1,203 @@
+# ==============================================================================
+# 0. IMPORTY
+# ==============================================================================
+
+import json
+from itertools import repeat
+from bgg_common import clean_html_text, process_list_to_prefix_format
+
+# ==============================================================================
+# 1. KONFIGURACE
+# ==============================================================================
+
+# Definice pořadí predikátů pro konzistentní výstup
+PROPERTY_ORDER = [
+    "schema:name", "schema:description", "schema:datePublished",
+    "bgg:minPlayers", "bgg:maxPlayers",
+    "bgg:minPlaytime", "bgg:maxPlaytime", "bgg:playingTime", "bgg:minAge",
+    "schema:author", "schema:contributor", "schema:publisher",
+    "schema:genre", "schema:isPartOf", "schema:partOfSeries",
+    "bgg:hasMechanic", "bgg:hasExpansion",
+    "bgg:ratingValue", "bgg:ratingCount"
+]
+
+PROPERTY_INDEX = {predicate: i for i, predicate in enumerate(PROPERTY_ORDER)}
+
+# Numerické metriky: (sloupec, predikát)
+INTEGER_PROPERTIES = [
+    ('min_players', 'bgg:minPlayers'), ('max_players', 'bgg:maxPlayers'),
+    ('min_playtime', 'bgg:minPlaytime'), ('max_playtime', 'bgg:maxPlaytime'),
+    ('playing_time', 'bgg:playingTime'), ('min_age', 'bgg:minAge'),
+]
+
+# Seznamy a vazby na entity: (sloupec, predikát, Turtle prefix)
+LIST_PROPERTIES = [
+    ('artist', 'schema:contributor', 'agent'),
+    ('designer', 'schema:author', 'agent'),
+    ('publisher', 'schema:publisher', 'agent'),
+    ('category', 'schema:genre', 'category'),
+    ('mechanic', 'bgg:hasMechanic', 'mechanic'),
+    ('family', 'schema:partOfSeries', 'family'),
+    ('compilation', 'schema:isPartOf', 'comp'),
+    ('expansion', 'bgg:hasExpansion', 'exp'),
+]
+
+# Sloupce datasetu, ze kterých se záznam skládá (pořadí = pořadí v n-tici řádku)
+SOURCE_COLUMNS = (
+    ['game_id', 'name', 'description', 'year_published']
+    + [col for col, _ in INTEGER_PROPERTIES]
+    + [col for col, _, _ in LIST_PROPERTIES]
+    + ['average_rating', 'users_rated']
+)
+
+# Pozice seznamového predikátu v GameRecord.links
+LIST_INDEX = {pred: i for i, (_, pred, _) in enumerate(LIST_PROPERTIES)}
+LIST_PREFIX = {pred: prefix for _, pred, prefix in LIST_PROPERTIES}
+
+# ==============================================================================
+# 2. ZÁZNAM HRY
+# ==============================================================================
+
+class GameRecord:
+    """
+    Kompaktní záznam jedné hry sdílený serializérem, linkerem i analytikou.
+
+    description - surový text popisu z datasetu (odkaz, ne kopie); čistí se
+                  a převádí na Turtle literál až při serializaci (render_record).
+    objects     - n-tice dlouhá jako PROPERTY_ORDER; na indexu literálového predikátu
+                  je None nebo n-tice hotových Turtle literálů ('"Catan"', '"4"^^xsd:integer'...).
+                  Bez literálů (with_literals=False) je None.
+    links       - n-tice podle LIST_PROPERTIES; pro každý seznamový predikát n-tice slugů.
+    """
+
+    __slots__ = ("game_id", "name", "users_rated", "description", "objects", "links")
+
+    def __init__(self, game_id, name, users_rated, description, objects, links):
+        self.game_id = game_id
+        self.name = name
+        self.users_rated = users_rated
+        self.description = description
+        self.objects = objects
+        self.links = links
+
+    def values(self, predicate):
+        """Turtle objekty daného predikátu (prázdná n-tice, pokud žádné nejsou)."""
+        if predicate in LIST_INDEX:
+            prefix = LIST_PREFIX[predicate]
+            return tuple(f"{prefix}:{slug}" for slug in self.links[LIST_INDEX[predicate]])
+        if predicate == "schema:description":
+            if not self.description: return ()
+            return (json.dumps(clean_html_text(self.description), ensure_ascii=False),)
+        if self.objects is None: return ()
+        return self.objects[PROPERTY_INDEX[predicate]] or ()
+
+    def slugs(self, predicate):
+        """Slugy entit daného predikátu ('mechanic:X' -> 'X')."""
+        return self.links[LIST_INDEX[predicate]]
+
+# ==============================================================================
+# 3. SESTAVENÍ ZÁZNAMŮ Z DATASETU
+# ==============================================================================
+
+def _positive_int(value):
+    try:
+        if float(value) > 0:
+            return (f'"{int(float(value))}"^^xsd:integer',)
+    except: pass
+    return None
+
+def iter_records(df, with_literals=True):
+    """
+    Postupně vytváří GameRecord pro každý řádek df (v jeho pořadí).
+    Prochází sloupce souběžně po n-ticích - bez iterrows(), bez slovníku na každý
+    řádek a bez kopie celých sloupců do seznamů (hodnoty se berou líně).
+
+    with_literals=False vynechá literály (rok, metriky, hodnocení) - pro fáze,
+    které potřebují jen ID, název a vazby na entity (analytika, podobnost, linker).
+    """
+    columns = [iter(df[col]) if col in df.columns else repeat("") for col in SOURCE_COLUMNS]
+
+    first_int = 4
+    first_list = first_int + len(INTEGER_PROPERTIES)
+    rating_pos = first_list + len(LIST_PROPERTIES)
+
+    int_slots = [PROPERTY_INDEX[pred] for _, pred in INTEGER_PROPERTIES]
+
+    name_slot = PROPERTY_INDEX["schema:name"]
+    year_slot = PROPERTY_INDEX["schema:datePublished"]
+    rating_value_slot = PROPERTY_INDEX["bgg:ratingValue"]
+    rating_count_slot = PROPERTY_INDEX["bgg:ratingCount"]
+
+    for row in zip(*columns):
+        clean_name = clean_html_text(row[1]) if row[1] else ""
+        average_rating, users_rated = row[rating_pos], row[rating_pos + 1]
+
+        # 1. Vazby na entity - slugy bez prefixu (prefix doplní až serializace)
+        links = tuple(tuple(process_list_to_prefix_format(row[first_list + offset]))
+                      for offset in range(len(LIST_PROPERTIES)))
+
+        objects = None
+        if with_literals:
+            objects = [None] * len(PROPERTY_ORDER)
+
+            # 2. Zpracování literálů (název, rok); popis se zpracuje až při serializaci
+            if row[1]:
+                objects[name_slot] = (json.dumps(clean_name, ensure_ascii=False),)
+
+            try:
+                objects[year_slot] = (f'"{int(float(row[3]))}"^^xsd:gYear',)
+            except: pass
+
+            # 3. Zpracování numerických metrik
+            for offset, slot in enumerate(int_slots):
+                objects[slot] = _positive_int(row[first_int + offset])
+
+            # 4. Zpracování hodnocení
+            try:
+                if average_rating:
+                    objects[rating_value_slot] = (f'"{float(average_rating)}"^^xsd:decimal',)
+                if users_rated:
+                    objects[rating_count_slot] = (f'"{int(float(users_rated))}"^^xsd:integer',)
+            except: pass
+
+            objects = tuple(objects)
+
+        try:
+            rating_count = int(float(users_rated))
+        except (TypeError, ValueError):
+            rating_count = 0
+
+        description = row[2] if with_literals and row[2] else None
+        yield GameRecord(str(row[0]), clean_name, rating_count, description, objects, links)
+
+def build_records(df, with_literals=True):
+    """Všechny záznamy najednou (pro fáze, které potřebují celý dataset)."""
+    return list(iter_records(df, with_literals))
+
+# ==============================================================================
+# 4. SERIALIZACE DO TURTLE
+# ==============================================================================
+
+def render_record(record):
+    """
+    Vrátí Turtle blok jedné hry (včetně prázdného řádku na konci).
+    Popis a prefixované vazby se sestavují až zde, záznam drží jen surová data.
+    """
+    subject_uri = f"game:{record.game_id}"
+    valid = [(key, values) for key in PROPERTY_ORDER for values in [record.values(key)] if values]
+
+    if not valid:
+        return f"{subject_uri} a schema:Game .\n\n\n"
+
+    lines = [f"{subject_uri} a schema:Game ;\n"]
+    for i, (key, values_list) in enumerate(valid):
+        # Výpočet odsazení pro formátování více hodnot
+        indent_str = "\n" + (" " * (4 + len(key) + 1))
+        values_joined = ("," + indent_str).join(values_list)
+
+        terminator = "." if (i == len(valid) - 1) else ";"
+        # Části se skládají až jedním join() - dlouhý popis se tak nekopíruje do mezivýsledku
+        lines += ("    ", key, " ", values_joined, " ", terminator, "\n")
+
+    lines.append("\n")
+    return "".join(lines)
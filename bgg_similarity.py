@@ -0,0 +1,182 @@
+# ==============================================================================
+# 0. IMPORTY
+# ==============================================================================
+
+import numpy as np
+import scipy.sparse as sp
+import pandas as pd
+from pathlib import Path
+from bgg_common import prefix_header, load_dataset
+from bgg_records import build_records
+from bgg_analytics import build_incidence
+
+# ==============================================================================
+# 1. KONFIGURACE
+# ==============================================================================
+
+version = "final"
+
+SCRIPT_DIR = Path(__file__).parent.resolve()
+OUTPUT_FILE = SCRIPT_DIR / "output" / f"similarity_{version}.ttl"
+
+# Počet nejpodobnějších her pro každou hru
+TOP_K = 10
+
+# "cosine" (vážené příznaky, normalizace L2) nebo "jaccard" (binární příznaky)
+METRIC = "cosine"
+
+# Dvojice s nižším skóre se nezapisují
+MIN_SCORE = 0.1
+
+# Horní mez paměti (MB) pro hustý blok podobností - určuje, kolik her se počítá najednou
+MEMORY_CAP_MB = 256
+
+# Skupiny příznaků: název -> (predikáty záznamu hry, váha pro cosine)
+FEATURE_SPECS = {
+    "mechanics":  (['bgg:hasMechanic'],      1.0),
+    "categories": (['schema:genre'],         1.0),
+    "designers":  (['schema:author'],        1.0),
+    "families":   (['schema:partOfSeries'],  1.0),
+}
+
+# ==============================================================================
+# 2. PŘÍZNAKOVÉ VEKTORY
+# ==============================================================================
+
+def build_features(records, metric=METRIC):
+    """
+    Sestaví řídkou matici hry × příznaky (CSR, float32) ze skupin FEATURE_SPECS.
+    Pro cosine se skupiny násobí vahou a řádky normalizují na jednotkovou délku,
+    pro jaccard zůstávají binární.
+    """
+    blocks = []
+    for name, (predicates, weight) in FEATURE_SPECS.items():
+        matrix, labels = build_incidence(records, predicates)
+        if metric == "cosine":
+            matrix = matrix * weight
+        blocks.append(matrix.astype(np.float32))
+        print(f"[INFO] Příznaky '{name}': {len(labels)}")
+
+    features = sp.hstack(blocks, format="csr")
+
+    if metric == "cosine":
+        norms = np.sqrt(np.asarray(features.multiply(features).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        features = sp.csr_matrix(sp.diags(1 / norms) @ features, dtype=np.float32)
+
+    return features
+
+# ==============================================================================
+# 3. TOP-K PODOBNOST PO BLOCÍCH
+# ==============================================================================
+
+# Paměť na jednu buňku bloku (řádek × hra) v nejhorším případě:
+#   řídký součin (float32 hodnota + int32 index = 8 B na nenulový prvek, při hustém součinu
+#   je nenulová každá buňka) vedle své husté kopie toarray() (4 B) + rezerva 4 B
+#   na řez matice příznaků a drobné mezivýsledky
+BLOCK_BYTES_PER_CELL = 16
+# Výběr top-k (int64 indexy z argpartition, jmenovatel Jaccardu) běží po menších
+# pod-blocích, aby se vešel do zbytku limitu: 1 / SELECT_SPLIT řádků bloku najednou
+SELECT_BYTES_PER_CELL = 16
+SELECT_SPLIT = 4
+
+def block_rows(n_games, memory_cap_mb=MEMORY_CAP_MB, reserved_bytes=0):
+    """
+    Kolik řádků se vejde do jednoho bloku, aby špička nepřekročila memory_cap_mb.
+    Řídký součin se po převodu na hustý blok uvolní, výběr top-k pak běží po pod-blocích
+    (SELECT_SPLIT) - na buňku bloku tak připadá max(součin + hustá kopie, hustá kopie + výběr).
+    reserved_bytes = paměť držená po celou dobu výpočtu (transponovaná matice příznaků).
+    """
+    bytes_per_cell = max(BLOCK_BYTES_PER_CELL, 4 + SELECT_BYTES_PER_CELL / SELECT_SPLIT)
+    budget = memory_cap_mb * 1024 * 1024 - reserved_bytes
+    return max(1, int(budget // (n_games * bytes_per_cell)))
+
+def top_k_similar(features, k=TOP_K, metric=METRIC, memory_cap_mb=MEMORY_CAP_MB, min_score=MIN_SCORE):
+    """
+    Pro každou hru vrátí k nejpodobnějších her.
+    Podobnost se počítá řídkým součinem po blocích řádků, takže paměť
+    je omezena memory_cap_mb místo celé matice n × n.
+
+    Generuje n-tice (index_hry, [(index_souseda, skóre), ...]) seřazené sestupně podle skóre.
+    """
+    n = features.shape[0]
+    k = min(k, n - 1)
+    if k <= 0:
+        return
+
+    features_t = features.T.tocsr()
+    sizes = np.asarray(features.sum(axis=1)).ravel() if metric == "jaccard" else None
+    reserved = features_t.data.nbytes + features_t.indices.nbytes + features_t.indptr.nbytes
+    step = block_rows(n, memory_cap_mb, reserved)
+    sub_step = max(1, step // SELECT_SPLIT)
+
+    for start in range(0, n, step):
+        stop = min(start + step, n)
+        product = features[start:stop] @ features_t
+        scores = product.toarray()
+        del product
+
+        for sub_start in range(start, stop, sub_step):
+            sub_stop = min(sub_start + sub_step, stop)
+            chunk = scores[sub_start - start:sub_stop - start]
+
+            if metric == "jaccard":
+                # |A ∩ B| / (|A| + |B| - |A ∩ B|)
+                union = sizes[sub_start:sub_stop, None] + sizes[None, :] - chunk
+                np.divide(chunk, union, out=chunk, where=union > 0)
+                del union
+
+            # Hra není podobná sama sobě
+            chunk[np.arange(sub_stop - sub_start), np.arange(sub_start, sub_stop)] = 0
+
+            # Záporné skóre na místě (bez kopie) -> argpartition vybere k největších
+            np.negative(chunk, out=chunk)
+            top = np.argpartition(chunk, k - 1, axis=1)[:, :k]
+            for local, neighbors in enumerate(top):
+                row_scores = -chunk[local, neighbors]
+                order = np.argsort(-row_scores)
+                yield sub_start + local, [(int(j), float(s)) for j, s in zip(neighbors[order], row_scores[order])
+                                          if s >= min_score]
+
+        # Uvolnit blok dřív, než se spočítá další (jinak by se špičky sčítaly)
+        del scores, chunk, top
+
+# ==============================================================================
+# 4. HLAVNÍ PROCES
+# ==============================================================================
+
+def main():
+    print(f"=== PODOBNOST HER (top-{TOP_K}, {METRIC}) ===")
+
+    df = load_dataset()
+    df['sort_id'] = pd.to_numeric(df['game_id'], errors='coerce')
+    df = df.sort_values('sort_id')
+    records = build_records(df, with_literals=False)
+    game_ids = [record.game_id for record in records]
+
+    features = build_features(records)
+    print(f"[INFO] Matice příznaků: {features.shape[0]} × {features.shape[1]}, "
+          f"blok {block_rows(features.shape[0])} her (limit {MEMORY_CAP_MB} MB)")
+
+    written = 0
+    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
+        f.write(prefix_header("xsd", "bgg", "game"))
+
+        for i, neighbors in top_k_similar(features):
+            if (i + 1) % 1000 == 0: print(f"Zpracováno {i + 1}/{len(game_ids)}")
+            if not neighbors: continue
+
+            subject = f"game:{game_ids[i]}"
+            for rank, (j, score) in enumerate(neighbors, start=1):
+                f.write(f"{subject} bgg:similarTo game:{game_ids[j]} .\n")
+                f.write(f"{subject} bgg:hasSimilarity [ a bgg:Similarity ; "
+                        f"bgg:similarGame game:{game_ids[j]} ; "
+                        f'bgg:similarityScore "{score:.4f}"^^xsd:decimal ; '
+                        f'bgg:similarityRank "{rank}"^^xsd:integer ] .\n')
+                written += 1
+            f.write("\n")
+
+    print(f"[SUCCESS] Hotovo. Zapsáno {written} dvojic. Soubor: {OUTPUT_FILE}")
+
+if __name__ == "__main__":
+    main()
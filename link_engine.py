@@ -0,0 +1,401 @@
+# ==============================================================================
+# 0. IMPORTY
+# ==============================================================================
+
+from SPARQLWrapper import SPARQLWrapper, JSON
+from concurrent.futures import ThreadPoolExecutor
+from collections import namedtuple
+from pathlib import Path
+import threading
+import json
+import time
+import sys
+import socket
+from bgg_common import prefix_header, load_dataset
+from link_queue import LinkQueue, default_worker_id, CLAIM_SIZE, MAX_IDLE_WAIT, HEARTBEAT_SECONDS
+from link_writer import BatchWriter
+
+# ==============================================================================
+# 1. KONFIGURACE
+# ==============================================================================
+
+SCRIPT_DIR = Path(__file__).parent.resolve()
+BATCHES_DIR = SCRIPT_DIR / "output" / "links_batches"
+CACHE_DIR = SCRIPT_DIR / "output" / "link_cache"
+
+WIKIDATA_ENDPOINT = "https://query.wikidata.org/sparql"
+USER_AGENT = "BoardGameGraphBot/1.0 (student project)"
+
+# Výchozí timeout dotazu, typ entity si ho může přenastavit (EntityType.timeout)
+TIMEOUT_SECONDS = 30
+SLEEP_TIME = 0.05
+
+# Počet souběžných dotazů na Wikidata (WDQS povoluje max. 5 na IP)
+CONCURRENCY = 4
+
+# Za kolik sekund se má worker k neúspěšným dotazům (timeout, 429, 5xx) vrátit
+RETRY_DELAY = 120
+
+# Stav výsledku dohledání
+RESULT_CACHED = "cache"    # převzato z cache
+RESULT_QUERIED = "query"   # dotaz proběhl (uri = shoda, nebo None = nenalezeno)
+RESULT_FAILED = "failed"   # dotaz selhal - nic se neukládá, zkusí se znovu
+
+# ==============================================================================
+# 2. DATOVÉ STRUKTURY
+# ==============================================================================
+
+# Jedna entita (třída ekvivalentních názvů) k propojení - dotazuje se jednou:
+#   key        - unikátní klíč v rámci typu (ID hry, jméno osoby...), používá fronta i cache
+#   name       - hlavní název z datasetu (nejčastější varianta)
+#   slugs      - lokální části IRI, na které se výsledek rozepíše (game:<slug>, agent:<slug>...)
+#   popularity - váha pro řazení (počet hodnocení / součet výskytů třídy)
+#   bgg_id     - BGG ID, pokud ho typ má (jinak "")
+#   aliases    - další názvy téže třídy, zkouší se po hlavním názvu
+Candidate = namedtuple("Candidate", ["key", "name", "slugs", "popularity", "bgg_id", "aliases"])
+
+class EntityType:
+    """
+    Konfigurace jednoho typu entit pro link discovery.
+
+    name           - název typu (fronta, cache, výstupní složka)
+    prefix         - Turtle prefix lokálních IRI (game, agent, category...)
+    extract        - funkce df -> seznam Candidate seřazený podle popularity
+    query_template - SPARQL šablona s poli {types}, {name} a volitelně {bgg_id}
+    types          - seznam Wikidata tříd / povolání dosazených do {types}
+    search_names   - funkce název -> seznam variant pro hledání (zkouší se postupně)
+    timeout        - timeout jednoho SPARQL dotazu v sekundách
+    link_predicate - predikát zapisovaného linku; owl:sameAs jen tam, kde jde o identitu,
+                     u pojmů (kategorie, mechaniky) slabší skos:closeMatch
+    """
+
+    def __init__(self, name, prefix, extract, query_template, types, search_names,
+                 timeout=TIMEOUT_SECONDS, link_predicate="owl:sameAs"):
+        self.name = name
+        self.prefix = prefix
+        self.extract = extract
+        self.query_template = query_template
+        self.types = types
+        self.search_names = search_names
+        self.timeout = timeout
+        self.link_predicate = link_predicate
+
+    def header(self):
+        """Hlavička dávkových souborů: prefix predikátu linku + prefix entit."""
+        return prefix_header(self.link_predicate.split(":", 1)[0], self.prefix)
+
+class QueryFailed(Exception):
+    """Dotaz na Wikidata selhal (timeout, rate limit, chyba serveru) - nejde o 'nenalezeno'."""
+
+class LinkCache:
+    """
+    Trvalá cache výsledků (key -> URI nebo None) v JSON Lines souboru.
+    Díky ní lze běh kdykoliv přerušit a znovu spustit - už dohledané entity
+    se znovu nedotazují, jen se zapíší do výstupu.
+    """
+
+    def __init__(self, entity_name):
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        self.path = CACHE_DIR / f"{entity_name}.jsonl"
+        self.lock = threading.Lock()
+        self.data = {}
+
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # nedopsaný poslední řádek po pádu
+                    self.data[record["key"]] = record["uri"]
+
+    def get(self, key):
+        """Vrací (nalezeno_v_cache, uri)."""
+        with self.lock:
+            if key in self.data:
+                return True, self.data[key]
+        return False, None
+
+    def put(self, key, uri):
+        line = json.dumps({"key": key, "uri": uri}, ensure_ascii=False) + "\n"
+        with self.lock:
+            self.data[key] = uri
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+# ==============================================================================
+# 3. POMOCNÉ FUNKCE
+# ==============================================================================
+
+def format_time(seconds):
+    m, s = divmod(int(seconds), 60)
+    h, m = divmod(m, 60)
+    if h > 0: return f"{h}h {m:02d}m"
+    return f"{m}m {s:02d}s"
+
+def check_connection():
+    try:
+        socket.create_connection(("query.wikidata.org", 443), timeout=5)
+        return True
+    except OSError:
+        print("[CHYBA] Nelze se připojit k Wikidatům.")
+        return False
+
+def load_candidates(entity):
+    df = load_dataset()
+    candidates = entity.extract(df)
+
+    print(f"[STATS] TOP 5 entit typu '{entity.name}' podle popularity:")
+    for c in candidates[:5]:
+        print(f"   - {c.name}: {c.popularity}")
+    return candidates
+
+def link_lines(entity, candidate, uri):
+    """Jeden nalezený výsledek -> řádek s predikátem linku pro každý slug třídy."""
+    return [f"{entity.prefix}:{slug} {entity.link_predicate} <{uri}> .\n" for slug in candidate.slugs]
+
+def chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+# ==============================================================================
+# 4. SPARQL LOGIKA
+# ==============================================================================
+
+def find_wikidata_uri(entity, candidate):
+    """
+    Postupně zkouší varianty hlavního názvu a aliasů (entity.search_names)
+    dosazené do šablony dotazu. Varianty lišící se jen velikostí písmen se
+    zkouší jen jednou (dotaz stejně porovnává přes LCASE).
+    Vrací URI první shody, nebo None, pokud všechny varianty proběhly bez shody.
+    Pokud nějaká varianta selhala a žádná neuspěla, vyhodí QueryFailed -
+    "nenalezeno" by pak nebylo spolehlivé.
+    """
+    sparql = SPARQLWrapper(WIKIDATA_ENDPOINT)
+    sparql.addCustomHttpHeader("User-Agent", USER_AGENT)
+    sparql.setTimeout(entity.timeout)
+    sparql.setReturnFormat(JSON)
+
+    types_str = " ".join(entity.types)
+
+    tried = set()
+    last_error = None
+    for search_name in (v for n in [candidate.name, *candidate.aliases] for v in entity.search_names(n)):
+        if not search_name or search_name.casefold() in tried: continue
+        tried.add(search_name.casefold())
+        # Escape uvozovek pro SPARQL
+        safe_name = search_name.replace('\\', '\\\\').replace('"', '\\"')
+
+        try:
+            sparql.setQuery(entity.query_template.format(
+                types=types_str, name=safe_name, bgg_id=candidate.bgg_id,
+            ))
+            bindings = sparql.query().convert()["results"]["bindings"]
+            if bindings:
+                return bindings[0]["item"]["value"]
+        except Exception as e:
+            print(f" [SPARQL ERROR] {e}")
+            last_error = e
+
+    if last_error is not None:
+        raise QueryFailed(str(last_error))
+    return None
+
+def iter_resolved(entity, candidates, cache, executor):
+    """
+    Dohledá dávku entit souběžně (executor). Výsledky generuje průběžně
+    ve stejném pořadí jako vstup: n-tice (candidate, uri, stav), kde stav je
+    RESULT_CACHED / RESULT_QUERIED / RESULT_FAILED.
+    Do cache jdou jen skutečně proběhlé dotazy, selhání ne.
+    """
+    def work(candidate):
+        hit, uri = cache.get(candidate.key)
+        if hit:
+            return candidate, uri, RESULT_CACHED
+
+        try:
+            uri = find_wikidata_uri(entity, candidate)
+        except QueryFailed:
+            time.sleep(SLEEP_TIME)
+            return candidate, None, RESULT_FAILED
+
+        cache.put(candidate.key, uri)
+        time.sleep(SLEEP_TIME)
+        return candidate, uri, RESULT_QUERIED
+
+    return executor.map(work, candidates)
+
+def resolve_batch(entity, candidates, cache, executor):
+    """Jako iter_resolved, jen vrátí celý seznam výsledků najednou."""
+    return list(iter_resolved(entity, candidates, cache, executor))
+
+# ==============================================================================
+# 5. REŽIMY BĚHU
+# ==============================================================================
+
+def run_sequential(entity):
+    """
+    Jeden proces projde všechny entity v pořadí popularity.
+    Opakované spuštění pokračuje díky cache.
+    """
+    print(f"=== FÁZE 4: Link Discovery ({entity.name.upper()} - RESUMABLE) ===")
+    if not check_connection(): return
+
+    candidates = load_candidates(entity)
+    total = len(candidates)
+
+    out_dir = BATCHES_DIR / f"links_{entity.name}"
+    print(f"[INFO] Výstupní složka: {out_dir}")
+
+    cache = LinkCache(entity.name)
+    writer = BatchWriter(out_dir, f"links_{entity.name}", entity.header())
+
+    found_count = 0
+    failed_count = 0
+    done = 0
+    queried = 0
+    loop_start_time = time.time()
+
+    try:
+        with ThreadPoolExecutor(max_workers=CONCURRENCY) as executor:
+            for batch in chunks(candidates, CLAIM_SIZE):
+                for candidate, uri, state in resolve_batch(entity, batch, cache, executor):
+                    done += 1
+                    if state != RESULT_CACHED: queried += 1
+                    if state == RESULT_FAILED: failed_count += 1
+
+                    # --- STATS ---
+                    percent = (done / total) * 100
+                    eta_str = "Kalibruji..."
+                    if queried > 20:
+                        avg = (time.time() - loop_start_time) / queried
+                        eta_str = format_time(avg * (total - done))
+
+                    display_name = (candidate.name[:25] + '..') if len(candidate.name) > 25 else candidate.name
+                    status = "✅" if uri else ("⚠️ chyba dotazu" if state == RESULT_FAILED else "❌")
+                    source = " (cache)" if state == RESULT_CACHED else ""
+                    print(f"[{done}/{total} | {percent:5.1f}% | ETA: {eta_str:<10}] "
+                          f"({candidate.popularity}x) {display_name:<30} -> {status}{source}")
+
+                    if uri:
+                        for line in link_lines(entity, candidate, uri):
+                            writer.write(line)
+                        found_count += 1
+                    writer.maybe_commit()
+    finally:
+        writer.close()
+
+    print(f"\n[SUCCESS] Hotovo! Nalezeno linků: {found_count}")
+    if failed_count:
+        print(f"[WARNING] {failed_count} dotazů selhalo (nejsou v cache) - spusťte běh znovu, zkusí se jen ony.")
+
+def run_enqueue(entity):
+    """
+    Koordinátor: vloží všechny entity do fronty v pořadí popularity.
+    Opakované spuštění nic nepřepisuje, jen doplní chybějící entity.
+    """
+    print(f"=== FÁZE 4: Link Discovery ({entity.name.upper()} - ENQUEUE) ===")
+    candidates = load_candidates(entity)
+
+    queue = LinkQueue()
+    try:
+        inserted = queue.enqueue(entity.name, ((c.key, c._asdict()) for c in candidates))
+        print(f"[INFO] Do fronty vloženo {inserted} nových entit ({queue.db_path}).")
+        print(f"[STATS] {queue.stats(entity.name)}")
+    finally:
+        queue.close()
+
+def run_worker(entity):
+    """
+    Worker: opakovaně si bere dávky z fronty, dohledává je a potvrzuje výsledky.
+    Lze spustit v libovolném počtu instancí na jednom stroji (viz omezení v LinkQueue).
+    """
+    worker_id = default_worker_id()
+    print(f"=== FÁZE 4: Link Discovery ({entity.name.upper()} - WORKER {worker_id}) ===")
+    if not check_connection(): return
+
+    cache = LinkCache(entity.name)
+    # Soubory patří jen tomuto workeru, workeři si je tak navzájem nepřepisují
+    writer = BatchWriter(BATCHES_DIR / f"links_{entity.name}", f"links_{entity.name}_{worker_id}",
+                         entity.header())
+    queue = LinkQueue()
+
+    found_count = 0
+
+    try:
+        with ThreadPoolExecutor(max_workers=CONCURRENCY) as executor:
+            while True:
+                batch = queue.claim(entity.name, worker_id, CLAIM_SIZE)
+                if not batch:
+                    stats = queue.stats(entity.name)
+                    # Zbývají jen konečné stavy ('done', 'failed') -> fronta je vyřízená
+                    if stats["pending"] == 0 and stats["leased"] == 0:
+                        if stats["failed"]:
+                            print(f"[INFO] {stats['failed']} entit vzdáno po {queue.max_attempts} pokusech.")
+                        break
+
+                    # Zbytek drží jiní workeři - počkáme, až jejich lease vyprší
+                    # (spadlý worker), nebo až dávky dokončí
+                    expiry = queue.next_lease_expiry(entity.name)
+                    wait = min(MAX_IDLE_WAIT, max(1.0, (expiry or 0) - time.time()))
+                    print(f"[{worker_id}] Volné dávky nejsou, zapůjčeno: {stats['leased']} - čekám {wait:.0f}s")
+                    time.sleep(wait)
+                    continue
+
+                candidates = [Candidate(**payload) for _, payload in batch]
+                keys = [c.key for c in candidates]
+
+                # Výsledky přebíráme průběžně a mezi nimi prodlužujeme lease,
+                # aby pomalou, ale živou dávku nepřevzal jiný worker
+                results = []
+                last_heartbeat = time.time()
+                for result in iter_resolved(entity, candidates, cache, executor):
+                    results.append(result)
+                    if time.time() - last_heartbeat >= HEARTBEAT_SECONDS:
+                        queue.extend(entity.name, worker_id, keys)
+                        last_heartbeat = time.time()
+
+                for candidate, uri, _ in results:
+                    if uri:
+                        for line in link_lines(entity, candidate, uri):
+                            writer.write(line)
+                        found_count += 1
+
+                # Nejdřív výsledky na disk, teprve pak potvrzení ve frontě.
+                # Pád mezi tím = dávka se po vypršení lease zpracuje znovu (duplicitní triple nevadí).
+                writer.sync()
+                queue.complete(entity.name, worker_id,
+                               [(c.key, uri) for c, uri, state in results if state != RESULT_FAILED])
+
+                # Selhané dotazy se nepotvrzují - vrátí se do fronty s odstupem
+                failed = [c.key for c, _, state in results if state == RESULT_FAILED]
+                if failed:
+                    given_up = queue.retry_later(entity.name, worker_id, failed, RETRY_DELAY)
+                    print(f"[{worker_id}] {len(failed)} dotazů selhalo, {len(failed) - given_up} se vrací "
+                          f"do fronty za {RETRY_DELAY}s, {given_up} vzdáno (limit {queue.max_attempts} pokusů)")
+
+                stats = queue.stats(entity.name)
+                print(f"[{worker_id}] Dávka {len(batch)} entit hotová | nalezeno: {found_count} | fronta: {stats}")
+    finally:
+        writer.close()
+        queue.close()
+
+    print(f"\n[SUCCESS] Fronta je prázdná. Tento worker nalezl: {found_count}")
+
+def run_cli(entity, argv):
+    """
+    Spustí zvolený režim podle argumentu příkazové řádky:
+      (nic) / run -> sekvenční běh
+      enqueue     -> naplnění fronty (koordinátor)
+      worker      -> worker nad frontou
+    """
+    mode = argv[0] if argv else "run"
+    if mode == "enqueue":
+        run_enqueue(entity)
+    elif mode == "worker":
+        run_worker(entity)
+    elif mode == "run":
+        run_sequential(entity)
+    else:
+        print(f"[CHYBA] Neznámý režim '{mode}' (run | enqueue | worker).")
+        sys.exit(1)
@@ -0,0 +1,357 @@
+# ==============================================================================
+# 0. IMPORTY
+# ==============================================================================
+
+import pandas as pd
+from collections import Counter, defaultdict
+import re
+import sys
+from bgg_common import clean_for_prefix, split_list_items
+from bgg_records import iter_records
+from link_engine import EntityType, Candidate, run_cli
+
+# ==============================================================================
+# 1. WIKIDATA OMEZENÍ (TŘÍDY A POVOLÁNÍ)
+# ==============================================================================
+
+# Hry a rozšíření
+GAME_TYPES = [
+    "wd:Q131436",    # Board game
+    "wd:Q60474521",  # Expansion pack for board game
+    "wd:Q19272838",  # Board video game
+    "wd:Q734698",    # Collectible card game
+    "wd:Q142714",    # Card game
+    "wd:Q1643932",   # Tabletop role-playing game
+    "wd:Q3244175",   # Tabletop game
+    "wd:Q1272194",   # Tile-based game
+    "wd:Q3177859",   # Dedicated deck card game
+    "wd:Q788553",    # German-style board game
+    "wd:Q1515156",   # Dice game
+]
+
+# Autoři a ilustrátoři (P106 - povolání)
+ALLOWED_OCCUPATIONS = [
+    "wd:Q3191582",        # Video game artist
+    "wd:Q18882335",       # Video game designer
+    "wd:Q1544133",        # Board game designer
+    "wd:Q3630699",        # Game designer
+    # "wd:Q2500638",        # Creator                           |      2,864
+    # "wd:Q627325",         # Graphic Designer                  |      8,376
+    # "wd:Q5322166",        # Designer (Generic)                |     16,689
+    # "wd:Q1925963",        # Graphic Artist                    |     22,420
+    # "wd:Q644687",         # Illustrator                       |     37,130
+    # "wd:Q483501",         # Artist                            |     81,362
+]
+
+# Vydavatelé, kategorie a mechaniky nemají v Wikidatech úzkou vlastní třídu -
+# hledáme je přes hry (GAME_TYPES), které je používají (viz used_by_game_query).
+
+# Rodiny her (série, franšízy)
+FAMILY_TYPES = [
+    "wd:Q7725310",   # Series of creative works
+    "wd:Q7058673",   # Video game series
+    "wd:Q196600",    # Media franchise
+]
+
+# ==============================================================================
+# 2. ŠABLONY DOTAZŮ
+# ==============================================================================
+
+# HYBRIDNÍ DOTAZ PRO HRY:
+# Zkusí najít shodu podle ID. Když nenajde, hledá podle jména.
+# Seřadí výsledky tak, aby ID mělo přednost.
+GAME_QUERY = """
+SELECT ?item ?priority WHERE {{
+  {{
+    # --- 1. PRIORITA: Hledání podle BGG ID (P2339) ---
+    ?item wdt:P2339 "{bgg_id}" .
+    BIND(1 AS ?priority)
+  }}
+  UNION
+  {{
+    # --- 2. PRIORITA: Hledání podle Názvu (Fallback) ---
+    VALUES ?type {{ {types} }}
+    ?item wdt:P31 ?type .
+    ?item rdfs:label|skos:altLabel ?label .
+    FILTER(LCASE(STR(?label)) = LCASE("{name}"))
+    BIND(2 AS ?priority)
+  }}
+}}
+ORDER BY ASC(?priority)
+LIMIT 1
+"""
+
+# Osoby: člověk (Q5) s některým z povolených povolání
+PERSON_QUERY = """
+SELECT ?item WHERE {{
+  VALUES ?occupation {{ {types} }}
+  ?item wdt:P106 ?occupation .
+  ?item rdfs:label ?label .
+  FILTER(LCASE(STR(?label)) = LCASE("{name}"))
+  ?item wdt:P31 wd:Q5 .
+}}
+LIMIT 1
+"""
+
+# Obecný dotaz: instance některé z tříd se shodným názvem
+LABEL_QUERY = """
+SELECT ?item WHERE {{
+  VALUES ?type {{ {types} }}
+  ?item wdt:P31 ?type .
+  ?item rdfs:label|skos:altLabel ?label .
+  FILTER(LCASE(STR(?label)) = LCASE("{name}"))
+}}
+LIMIT 1
+"""
+
+def used_by_game_query(game_property):
+    """
+    Dotaz na entitu, kterou nějaká hra (instance GAME_TYPES) uvádí ve vlastnosti
+    game_property - např. vydavatel (P123), žánr (P136), herní mechanika (P4151).
+    Samotná shoda názvu s obecnou položkou ('Fantasy', 'Economic') tak nestačí.
+    """
+    return """
+SELECT ?item WHERE {{
+  VALUES ?type {{ {types} }}
+  ?game wdt:P31 ?type .
+  ?game """ + game_property + """ ?item .
+  ?item rdfs:label|skos:altLabel ?label .
+  FILTER(LCASE(STR(?label)) = LCASE("{name}"))
+}}
+LIMIT 1
+"""
+
+PUBLISHER_QUERY = used_by_game_query("wdt:P123")   # Publisher
+CATEGORY_QUERY = used_by_game_query("wdt:P136")    # Genre
+MECHANIC_QUERY = used_by_game_query("wdt:P4151")   # Game mechanics
+
+# ==============================================================================
+# 3. VARIANTY NÁZVŮ PRO HLEDÁNÍ
+# ==============================================================================
+
+def strip_parentheses(name):
+    """
+    Odstraňuje věci v závorkách, např. 'Catan (5th Edition)' -> 'Catan'.
+    """
+    if pd.isna(name): return ""
+    return re.sub(r'\s*\(.*?\)', '', str(name)).strip()
+
+def default_search_names(name):
+    return [strip_parentheses(name)]
+
+def person_search_names(name):
+    """
+    Jméno bez závorek, a pokud je ve tvaru 'Příjmení, Jméno', i otočená varianta.
+    """
+    search_name = strip_parentheses(name)
+    names = [search_name]
+
+    if "," in search_name:
+        parts = search_name.split(",", 1)
+        names.append(f"{parts[1].strip()} {parts[0].strip()}")
+    return names
+
+def family_search_names(name):
+    """
+    Rodiny mají často tvar 'Typ: Název' (např. 'Series: Catan') - hledáme i samotný název.
+    """
+    search_name = strip_parentheses(name)
+    names = [search_name]
+
+    if ":" in search_name:
+        names.append(search_name.split(":", 1)[1].strip())
+    return names
+
+# Rozlišovací přípona BGG pro různé osoby/firmy se stejným jménem: 'John Smith (I)', '(II)', '(2)'
+DISAMBIGUATOR_PATTERN = re.compile(r'\(\s*([IVXLC]+|\d+)\s*\)\s*$')
+
+def disambiguator(name):
+    """
+    Vrátí rozlišovací příponu názvu ('i', 'ii', '2'...), nebo prázdný řetězec.
+    """
+    if pd.isna(name): return ""
+    match = DISAMBIGUATOR_PATTERN.search(str(name))
+    return match.group(1).casefold() if match else ""
+
+def name_key(name):
+    """
+    Normalizovaný vyhledávací klíč: bez závorek, sjednocené mezery, bez ohledu na velikost písmen.
+    'Catan (5th Edition)' i 'catan' -> 'catan'.
+    Rozlišovací přípona se ponechá, jde o jinou entitu: 'Reiner Knizia (II)' -> 'reiner knizia (ii)'.
+    """
+    key = " ".join(strip_parentheses(name).split()).casefold()
+    suffix = disambiguator(name)
+    return f"{key} ({suffix})" if suffix else key
+
+def person_key(name):
+    """
+    Jako name_key, jen 'Příjmení, Jméno' se nejdřív otočí na 'Jméno Příjmení'.
+    """
+    search_name = strip_parentheses(name)
+    if "," in search_name:
+        parts = search_name.split(",", 1)
+        search_name = f"{parts[1].strip()} {parts[0].strip()}"
+    key = name_key(search_name)
+    suffix = disambiguator(name)
+    return f"{key} ({suffix})" if suffix else key
+
+# ==============================================================================
+# 4. PLÁNOVÁNÍ DOTAZŮ (TŘÍDY EKVIVALENCE)
+# ==============================================================================
+
+# Názvy, které nejsou skutečné entity (porovnává se name_key, takže i '(Uncredited)')
+IGNORED_NAMES = {"", "uncredited"}
+
+# Náhradní slug clean_for_prefix pro názvy bez použitelných znaků ('???', '-') -
+# takové názvy by se přes společný slug spojily do jedné nesmyslné třídy
+UNKNOWN_SLUG = "unknown"
+
+def plan_query_classes(counts, search_key):
+    """
+    Seskupí surové názvy do tříd ekvivalence ještě před jakýmkoliv dotazem.
+    Dva názvy patří do stejné třídy, pokud mají stejný slug (clean_for_prefix)
+    nebo stejný vyhledávací klíč (search_key) - i přes další názvy (tranzitivně).
+
+    Každá třída = jeden Candidate (dotazuje se jednou), výsledek se rozepíše na
+    všechny slugy třídy. Třídy jsou seřazeny podle součtu výskytů.
+    """
+    parent = {name: name for name in counts}
+
+    def find(name):
+        while parent[name] != name:
+            parent[name] = parent[parent[name]]
+            name = parent[name]
+        return name
+
+    first_by_slug = {}
+    first_by_key = {}
+    for name in counts:
+        for index, value in ((first_by_slug, clean_for_prefix(name)), (first_by_key, search_key(name))):
+            if value in index:
+                parent[find(name)] = find(index[value])
+            else:
+                index[value] = name
+
+    groups = defaultdict(list)
+    for name in counts:
+        groups[find(name)].append(name)
+
+    candidates = []
+    for members in groups.values():
+        # Hlavní název = nejčastější varianta
+        members.sort(key=lambda n: (-counts[n], n))
+        slugs = list(dict.fromkeys(clean_for_prefix(n) for n in members))
+        popularity = sum(counts[n] for n in members)
+        candidates.append(Candidate(members[0], members[0], slugs, popularity, "", members[1:]))
+
+    # Třídy, které se liší jen rozlišovací příponou ('X (I)', 'X (II)'), hledají na Wikidatech
+    # stejný název - dostaly by stejné URI a tím falešné owl:sameAs. Takové se vynechají.
+    by_base = defaultdict(list)
+    for candidate in candidates:
+        by_base[search_key(strip_parentheses(candidate.name))].append(candidate)
+    ambiguous = {c.key for group in by_base.values() if len(group) > 1
+                 and any(disambiguator(n) for c in group for n in [c.name, *c.aliases]) for c in group}
+    candidates = [c for c in candidates if c.key not in ambiguous]
+
+    candidates.sort(key=lambda c: (-c.popularity, c.key))
+
+    print(f"[STATS] {len(counts)} surových názvů -> {len(candidates) + len(ambiguous)} tříd -> "
+          f"{len(candidates)} dotazů ({len(counts) - len(candidates) - len(ambiguous)} ušetřeno sloučením)")
+    if ambiguous:
+        print(f"[INFO] Vynecháno {len(ambiguous)} nejednoznačných tříd (stejné jméno s příponou (I), (II)...)")
+    return candidates
+
+# ==============================================================================
+# 5. EXTRAKCE KANDIDÁTŮ Z DATASETU
+# ==============================================================================
+
+def extract_sorted_games(df):
+    """
+    Vrátí seznam her seřazený podle popularity (users_rated).
+    Bere se ze záznamů her (GameRecord) - stejné ID a vyčištěný název jako v serializéru.
+    """
+    candidates = [Candidate(r.game_id, r.name, [r.game_id], r.users_rated, r.game_id, [])
+                  for r in iter_records(df, with_literals=False) if r.name]
+
+    # Stabilní řazení - při shodě zůstává pořadí datasetu
+    candidates.sort(key=lambda c: -c.popularity)
+    return candidates
+
+def list_column_extractor(columns, search_key=name_key):
+    """
+    Vytvoří extrakční funkci pro sloupce se seznamy (oddělené čárkami).
+    Názvy se spočítají napříč zadanými sloupci a seskupí plánovačem
+    (plan_query_classes) podle slugu a search_key.
+    """
+    def extract(df):
+        cnt = Counter()
+        for col in columns:
+            if col not in df.columns: continue
+            for raw_text in df[col].dropna():
+                for name in split_list_items(raw_text):
+                    if name_key(name) not in IGNORED_NAMES and clean_for_prefix(name) != UNKNOWN_SLUG:
+                        cnt[name] += 1
+
+        return plan_query_classes(cnt, search_key)
+    return extract
+
+# ==============================================================================
+# 6. REGISTR TYPŮ ENTIT
+# ==============================================================================
+# Přidání nového typu = nový záznam zde (extrakce, prefix, omezení, šablona dotazu).
+
+ENTITY_TYPES = {
+    "games": EntityType(
+        name="games", prefix="game",
+        extract=extract_sorted_games,
+        query_template=GAME_QUERY, types=GAME_TYPES,
+        search_names=default_search_names,
+        timeout=10,
+    ),
+    "agents": EntityType(
+        name="agents", prefix="agent",
+        extract=list_column_extractor(['designer', 'artist'], search_key=person_key),
+        query_template=PERSON_QUERY, types=ALLOWED_OCCUPATIONS,
+        search_names=person_search_names,
+    ),
+    "publishers": EntityType(
+        name="publishers", prefix="agent",
+        extract=list_column_extractor(['publisher']),
+        query_template=PUBLISHER_QUERY, types=GAME_TYPES,
+        search_names=default_search_names,
+    ),
+    "categories": EntityType(
+        name="categories", prefix="category",
+        extract=list_column_extractor(['category']),
+        query_template=CATEGORY_QUERY, types=GAME_TYPES,
+        search_names=default_search_names,
+        link_predicate="skos:closeMatch",
+    ),
+    "mechanics": EntityType(
+        name="mechanics", prefix="mechanic",
+        extract=list_column_extractor(['mechanic']),
+        query_template=MECHANIC_QUERY, types=GAME_TYPES,
+        search_names=default_search_names,
+        link_predicate="skos:closeMatch",
+    ),
+    "families": EntityType(
+        name="families", prefix="family",
+        extract=list_column_extractor(['family']),
+        query_template=LABEL_QUERY, types=FAMILY_TYPES,
+        search_names=family_search_names,
+    ),
+    "expansions": EntityType(
+        name="expansions", prefix="exp",
+        extract=list_column_extractor(['expansion']),
+        query_template=LABEL_QUERY, types=GAME_TYPES,
+        search_names=default_search_names,
+    ),
+}
+
+if __name__ == "__main__":
+    # python link_entities.py <typ> [run | enqueue | worker]
+    if len(sys.argv) < 2 or sys.argv[1] not in ENTITY_TYPES:
+        print(f"Použití: python link_entities.py <{' | '.join(ENTITY_TYPES)}> [run | enqueue | worker]")
+        sys.exit(1)
+
+    run_cli(ENTITY_TYPES[sys.argv[1]], sys.argv[2:])
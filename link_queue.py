@@ -0,0 +1,265 @@
+# ==============================================================================
+# 0. IMPORTY
+# ==============================================================================
+
+import sqlite3
+import socket
+import time
+import json
+import os
+from pathlib import Path
+
+# ==============================================================================
+# 1. KONFIGURACE
+# ==============================================================================
+
+SCRIPT_DIR = Path(__file__).parent.resolve()
+QUEUE_DB = SCRIPT_DIR / "output" / "link_queue.sqlite"
+
+# Jak dlouho (s) patří zapůjčená dávka workerovi. Po vypršení ji může převzít jiný.
+LEASE_SECONDS = 600
+# Kolik položek si worker bere najednou
+CLAIM_SIZE = 50
+# Jak často (s) worker během zpracování dávky prodlužuje lease (heartbeat).
+# Dávka tak může trvat libovolně dlouho, pokud worker žije.
+HEARTBEAT_SECONDS = LEASE_SECONDS / 4
+# Nejdelší čekání (s) workeru na vypršení cizích lease, než znovu zkusí claim()
+MAX_IDLE_WAIT = 60
+# Jak dlouho (s) SQLite čeká na zámek, než vyhodí "database is locked"
+LOCK_TIMEOUT = 60
+# Kolikrát nejvýše se entita zapůjčí. Pak se označí jako 'failed' a už se nezkouší
+# (např. dotaz, který pokaždé narazí na timeout), aby se fronta mohla vyprázdnit.
+MAX_ATTEMPTS = 5
+
+STATUS_PENDING = "pending"
+STATUS_LEASED = "leased"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+# ==============================================================================
+# 2. PRACOVNÍ FRONTA
+# ==============================================================================
+
+def default_worker_id():
+    """
+    Identifikátor workeru ve tvaru 'hostname-pid'.
+    Unikátní i když běží více workerů na jednom stroji.
+    """
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+class LinkQueue:
+    """
+    Trvalá lokální fronta entit pro link discovery (SQLite tabulka s lease).
+
+    Koordinátor do ní jednou vloží entity (v pořadí popularity), libovolný počet
+    workerů si pak bere dávky přes claim(), vyřeší je a potvrdí přes complete().
+    Dávky, jejichž lease vypršel (spadlý worker), se automaticky vrací do oběhu.
+
+    Podporované nasazení: všichni workeři na jednom stroji, databáze na lokálním disku.
+    Vzájemné vyloučení stojí na zámcích souborů SQLite (BEGIN IMMEDIATE), které jsou
+    na síťových discích (NFS/SMB) nespolehlivé - hrozí dvojí zapůjčení i poškození
+    databáze. Lease navíc počítá s time.time() každého workeru, takže rozjeté hodiny
+    více strojů mohou převzít živou dávku předčasně. Běh přes více strojů je možný jen
+    nad souborovým systémem se spolehlivými zámky a se synchronizovanými hodinami (NTP).
+    """
+
+    def __init__(self, db_path=QUEUE_DB, lease_seconds=LEASE_SECONDS, max_attempts=MAX_ATTEMPTS):
+        self.db_path = Path(db_path)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # isolation_level=None -> transakce řídíme ručně (BEGIN IMMEDIATE)
+        # journal_mode=DELETE (klasický rollback journal) - WAL vyžaduje sdílenou paměť
+        # a na síťovém disku nefunguje vůbec
+        self.conn = sqlite3.connect(str(self.db_path), timeout=LOCK_TIMEOUT, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=DELETE")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                kind          TEXT    NOT NULL,
+                entity_key    TEXT    NOT NULL,
+                payload       TEXT    NOT NULL,
+                priority      INTEGER NOT NULL,
+                status        TEXT    NOT NULL DEFAULT 'pending',
+                lease_owner   TEXT,
+                lease_expires REAL,
+                attempts      INTEGER NOT NULL DEFAULT 0,
+                result        TEXT,
+                PRIMARY KEY (kind, entity_key)
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_claim ON tasks (kind, status, priority)")
+
+    def close(self):
+        self.conn.close()
+
+    def enqueue(self, kind, items):
+        """
+        Vloží entity do fronty. items = iterovatelné (entity_key, payload), již seřazené
+        podle popularity - pořadí se uloží jako priorita (0 = nejdůležitější).
+        Entity, které už ve frontě jsou, se nepřepisují (koordinátor lze spustit znovu).
+        Vrací počet nově vložených entit.
+        """
+        rows = [(kind, str(key), json.dumps(payload, ensure_ascii=False), priority)
+                for priority, (key, payload) in enumerate(items)]
+
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO tasks (kind, entity_key, payload, priority) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            inserted = self.conn.total_changes - before
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return inserted
+
+    def claim(self, kind, worker_id, batch_size=CLAIM_SIZE):
+        """
+        Zapůjčí workerovi dávku nejprioritnějších volných entit.
+        Volné = 'pending' nebo 'leased' s vypršelým lease.
+        Entity s vypršelým lease, které už vyčerpaly max_attempts (opakovaně shodily
+        workera), se místo zapůjčení označí jako 'failed'.
+        Vrací seznam n-tic (entity_key, payload).
+        """
+        now = time.time()
+
+        # BEGIN IMMEDIATE = zámek pro zápis hned, dva workeři tak nedostanou stejnou dávku
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.execute(
+                """
+                UPDATE tasks SET status = ?, lease_owner = NULL, lease_expires = NULL
+                WHERE kind = ? AND status = ? AND lease_expires < ? AND attempts >= ?
+                """,
+                (STATUS_FAILED, kind, STATUS_LEASED, now, self.max_attempts),
+            )
+            rows = self.conn.execute(
+                """
+                SELECT entity_key, payload FROM tasks
+                WHERE kind = ?
+                  AND (status = ? OR (status = ? AND lease_expires < ?))
+                ORDER BY priority
+                LIMIT ?
+                """,
+                (kind, STATUS_PENDING, STATUS_LEASED, now, batch_size),
+            ).fetchall()
+
+            self.conn.executemany(
+                """
+                UPDATE tasks
+                SET status = ?, lease_owner = ?, lease_expires = ?, attempts = attempts + 1
+                WHERE kind = ? AND entity_key = ?
+                """,
+                [(STATUS_LEASED, worker_id, now + self.lease_seconds, kind, key) for key, _ in rows],
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+        return [(key, json.loads(payload)) for key, payload in rows]
+
+    def complete(self, kind, worker_id, results):
+        """
+        Potvrdí vyřešené entity. results = iterovatelné (entity_key, uri_nebo_None).
+        Potvrzujeme jen entity, které má worker stále zapůjčené - pokud mu lease
+        mezitím vypršel a převzal je někdo jiný, jeho výsledek se nepřepisuje.
+        """
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.executemany(
+                """
+                UPDATE tasks
+                SET status = ?, result = ?, lease_owner = NULL, lease_expires = NULL
+                WHERE kind = ? AND entity_key = ? AND status = ? AND lease_owner = ?
+                """,
+                [(STATUS_DONE, uri, kind, str(key), STATUS_LEASED, worker_id) for key, uri in results],
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def stats(self, kind):
+        """
+        Vrátí počty entit podle stavu,
+        např. {'pending': 10, 'leased': 50, 'done': 440, 'failed': 2, 'found': 120}.
+        'done' a 'failed' jsou konečné stavy - fronta je vyřízená, když zbývají jen ony.
+        """
+        counts = {STATUS_PENDING: 0, STATUS_LEASED: 0, STATUS_DONE: 0, STATUS_FAILED: 0}
+        for status, n in self.conn.execute(
+            "SELECT status, COUNT(*) FROM tasks WHERE kind = ? GROUP BY status", (kind,)
+        ):
+            counts[status] = n
+        counts["found"] = self.conn.execute(
+            "SELECT COUNT(*) FROM tasks WHERE kind = ? AND result IS NOT NULL", (kind,)
+        ).fetchone()[0]
+        return counts
+
+    def next_lease_expiry(self, kind):
+        """
+        Čas (time.time()), kdy vyprší nejbližší zapůjčená dávka, nebo None,
+        pokud nic zapůjčeno není.
+        """
+        return self.conn.execute(
+            "SELECT MIN(lease_expires) FROM tasks WHERE kind = ? AND status = ?", (kind, STATUS_LEASED)
+        ).fetchone()[0]
+
+    def extend(self, kind, worker_id, keys):
+        """
+        Heartbeat: prodlouží lease workeru u zadaných entit o lease_seconds od teď.
+        Entity, které mu mezitím vypršely a převzal je jiný worker, se nemění.
+        """
+        expires = time.time() + self.lease_seconds
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.executemany(
+                """
+                UPDATE tasks SET lease_expires = ?
+                WHERE kind = ? AND entity_key = ? AND status = ? AND lease_owner = ?
+                """,
+                [(expires, kind, str(key), STATUS_LEASED, worker_id) for key in keys],
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def retry_later(self, kind, worker_id, keys, delay):
+        """
+        Vrátí entity workeru zpět do fronty až za delay sekund (např. po chybě
+        dotazu / rate limitu). Zůstávají zapůjčené, jen se zkrátí lease - po jeho
+        vypršení si je vezme kdokoliv přes claim().
+        Entity, které už vyčerpaly max_attempts, se místo toho označí jako 'failed'.
+        Vrací počet takto ukončených entit.
+        """
+        expires = time.time() + delay
+        keys = [str(key) for key in keys]
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                """
+                UPDATE tasks SET status = ?, lease_owner = NULL, lease_expires = NULL
+                WHERE kind = ? AND entity_key = ? AND status = ? AND lease_owner = ? AND attempts >= ?
+                """,
+                [(STATUS_FAILED, kind, key, STATUS_LEASED, worker_id, self.max_attempts) for key in keys],
+            )
+            given_up = self.conn.total_changes - before
+
+            self.conn.executemany(
+                """
+                UPDATE tasks SET lease_expires = ?
+                WHERE kind = ? AND entity_key = ? AND status = ? AND lease_owner = ?
+                """,
+                [(expires, kind, key, STATUS_LEASED, worker_id) for key in keys],
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return given_up
@@ -0,0 +1,141 @@
+# ==============================================================================
+# 0. IMPORTY
+# ==============================================================================
+
+from pathlib import Path
+import time
+import os
+
+# ==============================================================================
+# 1. KONFIGURACE
+# ==============================================================================
+
+# Kolik řádků (linků) má jeden dávkový soubor
+BATCH_SIZE = 500
+
+# Skupinový zápis: buffer se zapíše na disk po N záznamech nebo po T ms
+GROUP_COMMIT_RECORDS = 50
+GROUP_COMMIT_MS = 2000
+
+# Obsah dočasného souboru se před přejmenováním fsyncuje vždy - po výpadku
+# proudu je na disku buď předchozí, nebo nová kompletní verze souboru.
+# Politika určuje jen fsync složky, tj. kdy je trvalé i samotné přejmenování:
+#   "always" - po každém skupinovém zápisu
+#   "rotate" - jen když se dávkový soubor zaplní a při zavření
+#   "never"  - nikdy (po výpadku OS se může vrátit starší, ale úplná verze souboru)
+FSYNC_POLICY = "rotate"
+
+# ==============================================================================
+# 2. DÁVKOVÝ ZAPISOVAČ
+# ==============================================================================
+
+class BatchWriter:
+    """
+    Zapisuje linky do očíslovaných souborů '<stem>_NN.ttl' po batch_size řádcích.
+
+    Řádky se drží v paměti a na disk jdou skupinově (group commit) - každých
+    group_records záznamů nebo group_ms milisekund. Soubor se při každém zápisu
+    vytvoří celý znovu do dočasného souboru a atomicky přejmenuje (os.replace),
+    takže na disku je vždy kompletní soubor s hlavičkou prefixů, nikdy useknutý řádek.
+    """
+
+    def __init__(self, out_dir, stem, header, batch_size=BATCH_SIZE,
+                 group_records=GROUP_COMMIT_RECORDS, group_ms=GROUP_COMMIT_MS,
+                 fsync_policy=FSYNC_POLICY):
+        if fsync_policy not in ("always", "rotate", "never"):
+            raise ValueError(f"Neznámá fsync politika: {fsync_policy}")
+
+        self.out_dir = Path(out_dir)
+        self.stem = stem
+        self.header = header
+        self.batch_size = batch_size
+        self.group_records = group_records
+        self.group_ms = group_ms
+        self.fsync_policy = fsync_policy
+
+        self.batch_index = 0
+        self.committed = []        # řádky aktuálního souboru, které už jsou na disku
+        self.pending = []          # řádky čekající na skupinový zápis
+        self.first_pending_at = None
+        self.dir_unsynced = False  # poslední přejmenování ještě není potvrzené fsync složky
+
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+
+    def write(self, line):
+        """Přidá řádek do bufferu. Při dosažení group_records rovnou zapíše skupinu."""
+        if not self.pending:
+            self.first_pending_at = time.monotonic()
+        self.pending.append(line)
+
+        if len(self.pending) >= self.group_records:
+            self.commit()
+
+    def maybe_commit(self):
+        """Zapíše buffer, pokud nejstarší čekající řádek čeká déle než group_ms."""
+        if self.pending and (time.monotonic() - self.first_pending_at) * 1000 >= self.group_ms:
+            self.commit()
+
+    def commit(self):
+        """Zapíše všechny čekající řádky (případně přes více souborů)."""
+        while self.pending:
+            if self.batch_index == 0 or len(self.committed) >= self.batch_size:
+                self._rotate()
+
+            room = self.batch_size - len(self.committed)
+            self.committed.extend(self.pending[:room])
+            self.pending = self.pending[room:]
+
+            full = len(self.committed) >= self.batch_size
+            self._write_current()
+            if self.fsync_policy == "always" or (self.fsync_policy == "rotate" and full):
+                self._sync_dir()
+
+        self.first_pending_at = None
+
+    def sync(self):
+        """
+        Zapíše buffer a vynutí fsync složky bez ohledu na politiku
+        (např. před potvrzením dávky ve frontě).
+        """
+        self.commit()
+        if self.dir_unsynced:
+            self._sync_dir()
+
+    def close(self):
+        self.commit()
+        if self.dir_unsynced and self.fsync_policy != "never":
+            self._sync_dir()
+
+    def _current_path(self):
+        return self.out_dir / f"{self.stem}_{self.batch_index:02d}.ttl"
+
+    def _rotate(self):
+        self.batch_index += 1
+        self.committed = []
+        print(f"\n[SYSTEM] Zapisuji do souboru: {self._current_path().name}")
+
+    def _write_current(self):
+        path = self._current_path()
+        # Tečka na začátku -> dočasný soubor nechytí glob 'links_*.ttl' v merge skriptu
+        tmp_path = path.with_name(f".{path.name}.tmp")
+
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.header)
+            f.writelines(self.committed)
+            f.flush()
+            # Vždy - jinak by po výpadku mohl přejmenovaný soubor zůstat prázdný
+            os.fsync(f.fileno())
+
+        os.replace(tmp_path, path)
+        self.dir_unsynced = True
+
+    def _sync_dir(self):
+        # fsync složky potvrdí samotné přejmenování (na Windows složku otevřít nejde)
+        self.dir_unsynced = False
+        if not hasattr(os, "O_DIRECTORY"):
+            return
+        fd = os.open(self.out_dir, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
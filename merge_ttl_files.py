@@ -4,8 +4,8 @@ from pathlib import Path
 # KONFIGURACE
 # ==============================================================================
 
-VERSION = "games"
-SOURCE_DIR = Path(__file__).parent / "output" / "links_batchES" / f"links_{VERSION}" 
+VERSION = "games"  # games | agents | publishers | categories | mechanics | families | expansions
+SOURCE_DIR = Path(__file__).parent / "output" / "links_batches" / f"links_{VERSION}"
 OUTPUT_FILE = Path(__file__).parent / "output" / F"links_{VERSION}_merged_final.ttl"
 
 # ==============================================================================